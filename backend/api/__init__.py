@@ -1,10 +1,15 @@
 from fastapi import APIRouter
 from .analyze import router as analyze_router
 from .preview import router as preview_router
+from .deps import PRELOAD_PREDICTOR, warm_predictor
 
 # Create main API router
 api_router = APIRouter(prefix="/api")
 
 # Include all routers
 api_router.include_router(analyze_router)
-api_router.include_router(preview_router) 
\ No newline at end of file
+api_router.include_router(preview_router)
+
+# Optionally load the credibility model before the first request needs it
+if PRELOAD_PREDICTOR:
+    api_router.add_event_handler("startup", warm_predictor) 
\ No newline at end of file
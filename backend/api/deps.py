@@ -0,0 +1,33 @@
+from functools import lru_cache
+import asyncio
+import logging
+import os
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Set PRELOAD_PREDICTOR=1 to load the predictor at startup instead of on first use
+PRELOAD_PREDICTOR = os.getenv("PRELOAD_PREDICTOR", "").lower() in ("1", "true", "yes")
+
+@lru_cache(maxsize=1)
+def get_predictor():
+    """Return the shared credibility predictor, loading it on first use.
+
+    Use as a route dependency: ``predictor = Depends(get_predictor)``.
+    """
+    # Imported lazily so the API can start without torch being loaded
+    from data.training.predict import NewsCredibilityPredictor
+
+    predictor = NewsCredibilityPredictor()
+    # One throwaway forward pass so kernel selection happens before real traffic
+    predictor.predict("warmup")
+    return predictor
+
+async def warm_predictor():
+    """Load and warm the predictor at startup without blocking the event loop."""
+    try:
+        await asyncio.to_thread(get_predictor)
+        logger.info("Credibility predictor loaded and warmed up")
+    except Exception as e:
+        logger.error(f"Error loading credibility predictor: {str(e)}")
@@ -1,12 +1,17 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin
+from typing import Dict, Optional
+import asyncio
+import httpx
+import hishel
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urlparse, urljoin, urldefrag
+from cachetools import TTLCache
 import logging
 import traceback
 import ssl
+import os
+from pathlib import Path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -14,6 +19,43 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Shared HTTP client for preview fetches, opened on startup
+preview_client: Optional[httpx.AsyncClient] = None
+
+# On-disk HTTP cache; stale pages are revalidated with ETag/Last-Modified
+PREVIEW_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "http_cache")
+PREVIEW_CACHE_TTL = 86400
+
+@router.on_event("startup")
+async def open_preview_client():
+    global preview_client
+    preview_client = httpx.AsyncClient(
+        headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.5",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1"
+        },
+        timeout=10,
+        follow_redirects=True,
+        trust_env=False,  # Don't use environment variables for proxy settings
+        transport=hishel.AsyncCacheTransport(
+            transport=httpx.AsyncHTTPTransport(
+                verify=False,  # Disable SSL verification
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+            ),
+            storage=hishel.AsyncFileStorage(base_path=Path(PREVIEW_CACHE_DIR), ttl=PREVIEW_CACHE_TTL),
+            controller=hishel.Controller(allow_heuristics=True)
+        )
+    )
+
+@router.on_event("shutdown")
+async def close_preview_client():
+    if preview_client is not None:
+        await preview_client.aclose()
+
 class URLPreviewResponse(BaseModel):
     title: str
     description: Optional[str] = None
@@ -22,8 +64,58 @@ class URLPreviewResponse(BaseModel):
     author: Optional[str] = None
     date: Optional[str] = None
 
+# Finished previews keyed by normalized URL; failures are kept briefly so a
+# broken link isn't refetched on every retry. Failures are stored as
+# (status_code, detail) rather than the exception, which would gather frames
+# every time it was re-raised
+preview_cache = TTLCache(maxsize=10000, ttl=3600)
+failed_previews = TTLCache(maxsize=1024, ttl=60)
+# One lock per URL being fetched, so concurrent requests share a single fetch
+preview_locks: Dict[str, asyncio.Lock] = {}
+
+def preview_cache_key(url: str) -> str:
+    """Normalize a URL for cache lookups."""
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    try:
+        parsed_url = urlparse(urldefrag(url).url)
+    except ValueError:
+        # Unparseable URLs are keyed as-is; fetch_preview reports the error
+        return url
+    return parsed_url._replace(netloc=parsed_url.netloc.lower()).geturl()
+
 @router.get("/preview-url", response_model=URLPreviewResponse)
 async def preview_url(url: str):
+    key = preview_cache_key(url)
+    result = preview_cache.get(key)
+    if result is not None:
+        return result
+    
+    lock = preview_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            # Another request may have finished this URL while we waited
+            result = preview_cache.get(key)
+            if result is not None:
+                return result
+            error = failed_previews.get(key)
+            if error is not None:
+                status_code, detail = error
+                raise HTTPException(status_code=status_code, detail=detail)
+            
+            try:
+                result = await fetch_preview(url)
+            except HTTPException as e:
+                failed_previews[key] = (e.status_code, e.detail)
+                raise
+            preview_cache[key] = result
+            return result
+    finally:
+        if not lock.locked() and preview_locks.get(key) is lock:
+            del preview_locks[key]
+
+async def fetch_preview(url: str) -> dict:
+    """Fetch a page and extract its preview metadata."""
     try:
         logger.info(f"Received preview request for URL: {url}")
         
@@ -38,25 +130,13 @@ async def preview_url(url: str):
             logger.error(f"Invalid URL format: {url}")
             raise HTTPException(status_code=400, detail="Invalid URL format")
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1"
-        }
-
-        # Create a session with custom SSL context
-        session = requests.Session()
-        session.verify = False  # Disable SSL verification
-        session.trust_env = False  # Don't use environment variables for proxy settings
-        
         logger.info(f"Fetching preview for URL: {url}")
-        response = session.get(url, headers=headers, timeout=10)
+        response = await preview_client.get(url)
         response.raise_for_status()
 
         logger.info(f"Successfully fetched URL content, status code: {response.status_code}")
-        soup = BeautifulSoup(response.text, "html.parser")
+        # Lexbor assumes UTF-8 bytes, so decode with the declared charset if any
+        tree = LexborHTMLParser(response.text if response.charset_encoding else response.content)
 
         # Extract metadata
         title = None
@@ -65,47 +145,47 @@ async def preview_url(url: str):
         author = None
 
         # Try to get title from meta tags first
-        og_title = soup.find("meta", property="og:title")
+        og_title = tree.css_first('meta[property="og:title"]')
         if og_title:
-            title = og_title.get("content")
+            title = og_title.attributes.get("content")
             logger.info(f"Found og:title: {title}")
         if not title:
-            title_tag = soup.find("title")
+            title_tag = tree.css_first("title")
             if title_tag:
-                title = title_tag.text
+                title = title_tag.text()
                 logger.info(f"Found title tag: {title}")
 
         # Get description
-        og_desc = soup.find("meta", property="og:description")
+        og_desc = tree.css_first('meta[property="og:description"]')
         if og_desc:
-            description = og_desc.get("content")
+            description = og_desc.attributes.get("content")
             logger.info("Found og:description")
         if not description:
-            meta_desc = soup.find("meta", attrs={"name": "description"})
+            meta_desc = tree.css_first('meta[name="description"]')
             if meta_desc:
-                description = meta_desc.get("content")
+                description = meta_desc.attributes.get("content")
                 logger.info("Found meta description")
 
         # Get image
-        og_image = soup.find("meta", property="og:image")
+        og_image = tree.css_first('meta[property="og:image"]')
         if og_image:
-            image = og_image.get("content")
+            image = og_image.attributes.get("content")
             # Convert relative image URL to absolute
             if image and not image.startswith(('http://', 'https://')):
                 image = urljoin(url, image)
             logger.info(f"Found og:image: {image}")
 
         # Get author
-        author_tag = soup.find("meta", attrs={"name": "author"})
+        author_tag = tree.css_first('meta[name="author"]')
         if author_tag:
-            author = author_tag.get("content")
+            author = author_tag.attributes.get("content")
             logger.info(f"Found author: {author}")
 
         # If no title found, try to get it from the first h1 tag
         if not title:
-            h1_tag = soup.find("h1")
+            h1_tag = tree.css_first("h1")
             if h1_tag:
-                title = h1_tag.text.strip()
+                title = h1_tag.text().strip()
                 logger.info(f"Found h1 title: {title}")
 
         # If still no title, use the domain
@@ -126,23 +206,16 @@ async def preview_url(url: str):
         logger.debug(f"Preview data: {result}")
         return result
 
-    except requests.exceptions.SSLError as e:
-        logger.error(f"SSL Error for URL {url}: {str(e)}")
-        raise HTTPException(status_code=400, detail="SSL certificate verification failed")
-    except requests.exceptions.ConnectionError as e:
+    except httpx.ConnectError as e:
         logger.error(f"Connection Error for URL {url}: {str(e)}")
         raise HTTPException(status_code=400, detail="Could not connect to the URL")
-    except requests.exceptions.Timeout as e:
+    except httpx.TimeoutException as e:
         logger.error(f"Timeout Error for URL {url}: {str(e)}")
         raise HTTPException(status_code=400, detail="Request timed out")
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, httpx.InvalidURL, httpx.UnsupportedProtocol) as e:
         logger.error(f"Request Error for URL {url}: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Error fetching URL: {str(e)}")
     except Exception as e:
         logger.error(f"Unexpected error for URL {url}: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error processing URL preview: {str(e)}")
-    finally:
-        # Suppress only the single warning from urllib3 needed.
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
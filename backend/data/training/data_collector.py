@@ -1,28 +1,88 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+import asyncio
+import httpx
+import hishel
+import argparse
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
+import orjson
 import os
 from datetime import datetime
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Union
 import pandas as pd
-from tqdm import tqdm
-import time
+from tqdm.asyncio import tqdm
 import random
 import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urldefrag
+from pathlib import Path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Crawl limits: overall connections, in-flight requests per host, and the
+# pause each host slot takes after a request to stay polite
+MAX_CONNECTIONS = 64
+MAX_REQUESTS_PER_HOST = 4
+HOST_DELAY_SECONDS = 2
+
+# How long cached pages are kept on disk before being dropped
+CACHE_TTL_SECONDS = 86400
+
+# Patterns used by clean_text
+WHITESPACE_RE = re.compile(r'\s+')
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?;:\'\"()-]')
+REPEATED_PUNCTUATION_RE = re.compile(r'([.,!?;:])\1+')
+
+# Links that look like articles, and the media/account pages to skip among them
+ARTICLE_URL_RE = re.compile(r'article|news|story|report|analysis', re.IGNORECASE)
+SKIP_URL_RE = re.compile(r'video|gallery|photo|slideshow|login|signup', re.IGNORECASE)
+
+# Section pages are only scanned for links, so only build <a href> tags
+LINK_TAGS = SoupStrainer('a', href=True)
+
+# Responses worth retrying with backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 3
+
 class NewsDataCollector:
-    def __init__(self, output_dir: str = "training_data"):
+    def __init__(self, output_dir: str = "training_data", use_cache: bool = True):
         # Get the current directory
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.output_dir = os.path.join(current_dir, output_dir)
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # Pooled async client so repeated requests to a host reuse one connection
+        transport = httpx.AsyncHTTPTransport(
+            retries=MAX_RETRIES,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS)
+        )
+        if use_cache:
+            # Reruns revalidate unchanged pages with ETag/Last-Modified instead of re-downloading
+            transport = hishel.AsyncCacheTransport(
+                transport=transport,
+                storage=hishel.AsyncFileStorage(base_path=Path(current_dir) / "http_cache", ttl=CACHE_TTL_SECONDS),
+                controller=hishel.Controller(allow_heuristics=True)
+            )
+        self.client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=10,
+            follow_redirects=True,
+            transport=transport
+        )
+        # One semaphore per host bounds concurrent requests to each site
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+        # Normalized URLs already queued, shared by every section of the crawl
+        self.seen_urls: Set[str] = set()
+        
         # List of trusted news sources with their main sections
         self.trusted_sources = {
             'reuters.com': ['/world/', '/technology/', '/science/', '/business/', '/health/'],
@@ -41,9 +101,10 @@ class NewsDataCollector:
             'science.org': ['/news/', '/research/'],  # Added scientific journal
             'scientificamerican.com': ['/articles/', '/news/']  # Added science magazine
         }
+        self.trusted_domains = frozenset(self.trusted_sources)
         
-        # List of unreliable sources
-        self.unreliable_sources = [
+        # Set of unreliable sources
+        self.unreliable_sources = frozenset({
             'infowars.com',
             'naturalnews.com',
             'beforeitsnews.com',
@@ -69,178 +130,241 @@ class NewsDataCollector:
             'rawstory.com',
             'salon.com',
             'huffpost.com'
-        ]
+        })
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         if not text:
             return ""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         # Remove special characters but keep important punctuation
-        text = re.sub(r'[^\w\s.,!?;:\'\"()-]', '', text)
+        text = SPECIAL_CHARS_RE.sub('', text)
         # Remove multiple punctuation
-        text = re.sub(r'([.,!?;:])\1+', r'\1', text)
+        text = REPEATED_PUNCTUATION_RE.sub(r'\1', text)
         return text.strip()
 
-    def get_article_urls(self, base_url: str, section: str = "") -> List[str]:
+    def source_domain(self, url: str) -> Optional[str]:
+        """Return the known source a URL belongs to, matching subdomains such as www."""
+        parts = (urlparse(url).hostname or '').split('.')
+        for i in range(len(parts) - 1):
+            domain = '.'.join(parts[i:])
+            if domain in self.trusted_domains or domain in self.unreliable_sources:
+                return domain
+        return None
+
+    def mark_seen(self, url: str) -> bool:
+        """Record a URL as queued; return False if it was already seen."""
+        parsed = urlparse(urldefrag(url).url)
+        key = parsed._replace(netloc=parsed.netloc.lower(), path=parsed.path.rstrip('/')).geturl()
+        if key in self.seen_urls:
+            return False
+        self.seen_urls.add(key)
+        return True
+
+    async def fetch(self, url: str) -> Union[str, bytes]:
+        """Fetch a page body, limiting concurrency and pacing requests per host.
+
+        The body is decoded when the response declares a charset; otherwise the
+        raw bytes are returned so the parser can detect the encoding.
+        """
+        host = urlparse(url).netloc
+        slot = self.host_slots.setdefault(host, asyncio.Semaphore(MAX_REQUESTS_PER_HOST))
+        async with slot:
+            response = None
+            try:
+                for attempt in range(MAX_RETRIES + 1):
+                    response = await self.client.get(url)
+                    if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        return response.text if response.charset_encoding else response.content
+                    await asyncio.sleep(0.3 * 2 ** attempt)
+            finally:
+                # Pages answered from the disk cache never reached the site
+                if response is None or not response.extensions.get("from_cache"):
+                    await asyncio.sleep(HOST_DELAY_SECONDS)
+
+    async def get_article_urls(self, base_url: str, section: str = "") -> List[str]:
         """Get article URLs from a news section."""
         try:
             url = urljoin(base_url, section)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find article links
-            article_urls = []
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('/'):
-                    href = urljoin(base_url, href)
-                elif not href.startswith(('http://', 'https://')):
-                    href = urljoin(base_url, href)
-                
-                # Filter for article URLs
-                if any(keyword in href.lower() for keyword in ['article', 'news', 'story', 'report', 'analysis']):
-                    # Skip non-article URLs
-                    if any(skip in href.lower() for skip in ['video', 'gallery', 'photo', 'slideshow', 'login', 'signup']):
-                        continue
-                    article_urls.append(href)
-            
-            return list(set(article_urls))  # Remove duplicates
+            body = await self.fetch(url)
+            # Parse off the event loop so other downloads keep flowing
+            loop = asyncio.get_running_loop()
+            article_urls = await loop.run_in_executor(None, self.parse_article_urls, base_url, body)
+            # Drop links to sites we have no label for
+            return [u for u in article_urls if self.source_domain(u)]
         except Exception as e:
             logger.error(f"Error getting article URLs from {url}: {str(e)}")
             return []
 
-    def collect_article(self, url: str) -> Optional[Dict]:
+    def parse_article_urls(self, base_url: str, body: Union[str, bytes]) -> List[str]:
+        """Extract article links from a section page."""
+        soup = BeautifulSoup(body, 'lxml', parse_only=LINK_TAGS)
+        
+        # Find article links
+        article_urls = []
+        for link in soup.find_all('a', href=True):
+            href = link['href']
+            if href.startswith('/'):
+                href = urljoin(base_url, href)
+            elif not href.startswith(('http://', 'https://')):
+                href = urljoin(base_url, href)
+            
+            # Filter for article URLs
+            if ARTICLE_URL_RE.search(href):
+                # Skip non-article URLs
+                if SKIP_URL_RE.search(href):
+                    continue
+                article_urls.append(href)
+        
+        return list(set(article_urls))  # Remove duplicates
+
+    async def collect_article(self, url: str) -> Optional[Dict]:
         """Collect a single article's content and metadata."""
+        # Articles from unknown sites have no label to train on
+        if self.source_domain(url) is None:
+            return None
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract article content
-            article_text = ' '.join([p.text for p in soup.find_all('p')])
-            article_text = self.clean_text(article_text)
-            
-            # Extract metadata
-            title = soup.find('meta', property='og:title')
-            title = title.get('content') if title else None
-            if title:
-                title = self.clean_text(title)
-            
-            description = soup.find('meta', property='og:description')
-            description = description.get('content') if description else None
-            if description:
-                description = self.clean_text(description)
-            
-            author = soup.find('meta', property='article:author')
-            author = author.get('content') if author else None
-            
-            date = soup.find('meta', property='article:published_time')
-            date = date.get('content') if date else None
-            
-            # Determine credibility based on source
-            domain = urlparse(url).netloc
-            is_credible = domain in self.trusted_sources
-            is_unreliable = domain in self.unreliable_sources
-            
-            # Skip if no content or too short
-            if not article_text or len(article_text.split()) < 150:  # Increased minimum length
-                return None
-            
-            # Skip if missing essential metadata
-            if not title or not description:
-                return None
-            
-            # Skip if content seems like a list or gallery
-            if len(article_text.split()) > 1000 and any(keyword in title.lower() for keyword in ['top', 'list', 'gallery', 'slideshow']):
-                return None
-            
-            return {
-                'url': url,
-                'title': title,
-                'description': description,
-                'content': article_text,
-                'author': author,
-                'date': date,
-                'domain': domain,
-                'is_credible': is_credible,
-                'is_unreliable': is_unreliable,
-                'word_count': len(article_text.split())
-            }
+            body = await self.fetch(url)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.parse_article, url, body)
         except Exception as e:
             logger.error(f"Error collecting article from {url}: {str(e)}")
             return None
 
+    def parse_article(self, url: str, body: Union[str, bytes]) -> Optional[Dict]:
+        """Extract an article's content and metadata from its page."""
+        tree = LexborHTMLParser(body)
+        
+        # Extract article content
+        article_text = ' '.join(p.text() for p in tree.css('p'))
+        article_text = self.clean_text(article_text)
+        
+        # Extract metadata
+        title = tree.css_first('meta[property="og:title"]')
+        title = title.attributes.get('content') if title else None
+        if title:
+            title = self.clean_text(title)
+        
+        description = tree.css_first('meta[property="og:description"]')
+        description = description.attributes.get('content') if description else None
+        if description:
+            description = self.clean_text(description)
+        
+        author = tree.css_first('meta[property="article:author"]')
+        author = author.attributes.get('content') if author else None
+        
+        date = tree.css_first('meta[property="article:published_time"]')
+        date = date.attributes.get('content') if date else None
+        
+        # Determine credibility based on source
+        domain = urlparse(url).netloc
+        source = self.source_domain(url)
+        is_credible = source in self.trusted_domains
+        is_unreliable = source in self.unreliable_sources
+        
+        # Skip if no content or too short
+        if not article_text or len(article_text.split()) < 150:  # Increased minimum length
+            return None
+        
+        # Skip if missing essential metadata
+        if not title or not description:
+            return None
+        
+        # Skip if content seems like a list or gallery
+        if len(article_text.split()) > 1000 and any(keyword in title.lower() for keyword in ['top', 'list', 'gallery', 'slideshow']):
+            return None
+        
+        return {
+            'url': url,
+            'title': title,
+            'description': description,
+            'content': article_text,
+            'author': author,
+            'date': date,
+            'domain': domain,
+            'is_credible': is_credible,
+            'is_unreliable': is_unreliable,
+            'word_count': len(article_text.split())
+        }
+
     def save_articles(self, articles: List[Dict], filename: str):
         """Save collected articles to a JSON file."""
         output_path = os.path.join(self.output_dir, filename)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(articles, option=orjson.OPT_INDENT_2))
         logger.info(f"Saved {len(articles)} articles to {output_path}")
 
     def prepare_training_data(self, input_file: str, output_file: str):
         """Prepare collected data for model training."""
         # Read collected articles
         input_path = os.path.join(self.output_dir, input_file)
-        with open(input_path, 'r', encoding='utf-8') as f:
-            articles = json.load(f)
+        with open(input_path, 'rb') as f:
+            articles = orjson.loads(f.read())
         
         # Convert to DataFrame
         df = pd.DataFrame(articles)
         
         # Create labels
-        df['label'] = df.apply(lambda x: 1 if x['is_credible'] else 0, axis=1)
+        df['label'] = df['is_credible'].astype('int8')
         
-        # Prepare text for training
-        df['text'] = df.apply(lambda x: f"Title: {x['title']}\nDescription: {x['description']}\nContent: {x['content']}", axis=1)
+        # Prepare text for training with whole-column string concatenation
+        df['text'] = (
+            'Title: ' + df['title'].fillna('')
+            + '\nDescription: ' + df['description'].fillna('')
+            + '\nContent: ' + df['content'].fillna('')
+        )
         
         # Save prepared data
         output_path = os.path.join(self.output_dir, output_file)
         df[['text', 'label']].to_csv(output_path, index=False)
         logger.info(f"Prepared training data saved to {output_path}")
 
-def main():
-    collector = NewsDataCollector()
-    articles = []
+async def collect_section(collector: NewsDataCollector, base_url: str, section: str = "") -> List[Dict]:
+    """Collect up to 15 articles linked from one source section."""
+    logger.info(f"Collecting articles from {base_url}{section}")
+    article_urls = await collector.get_article_urls(base_url, section)
+    
+    # Queue links no other section has queued yet; only queued links are
+    # marked seen, so the rest stay available to other sections
+    queued = []
+    for url in article_urls:
+        if len(queued) == 15:
+            break
+        if collector.mark_seen(url):
+            queued.append(url)
+    
+    articles = await asyncio.gather(*(collector.collect_article(url) for url in queued))
+    return [article for article in articles if article]
+
+async def collect_all(collector: NewsDataCollector) -> List[Dict]:
+    """Crawl every trusted and unreliable source concurrently."""
+    jobs = []
     
     # Collect from trusted sources
     for domain, sections in collector.trusted_sources.items():
         base_url = f"https://www.{domain}"
         for section in sections:
-            logger.info(f"Collecting articles from {base_url}{section}")
-            article_urls = collector.get_article_urls(base_url, section)
-            
-            for url in tqdm(article_urls[:15], desc=f"Processing {domain}"):  # Increased to 15 articles per section
-                article = collector.collect_article(url)
-                if article:
-                    articles.append(article)
-                time.sleep(2)  # Increased delay to be nicer to servers
+            jobs.append(collect_section(collector, base_url, section))
     
     # Collect from unreliable sources
-    for domain in collector.unreliable_sources:
+    for domain in sorted(collector.unreliable_sources):
         base_url = f"https://www.{domain}"
-        logger.info(f"Collecting articles from {base_url}")
-        article_urls = collector.get_article_urls(base_url)
-        
-        for url in tqdm(article_urls[:15], desc=f"Processing {domain}"):  # Increased to 15 articles per source
-            article = collector.collect_article(url)
-            if article:
-                articles.append(article)
-            time.sleep(2)  # Increased delay to be nicer to servers
+        jobs.append(collect_section(collector, base_url))
+    
+    try:
+        results = await tqdm.gather(*jobs, desc="Processing sources")
+    finally:
+        await collector.client.aclose()
+    return [article for articles in results for article in articles]
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect news articles for model training")
+    parser.add_argument('--no-cache', action='store_true', help="Re-download every page instead of using the HTTP cache")
+    args = parser.parse_args()
+    
+    collector = NewsDataCollector(use_cache=not args.no_cache)
+    articles = asyncio.run(collect_all(collector))
     
     # Save collected articles
     collector.save_articles(articles, "collected_articles.json")
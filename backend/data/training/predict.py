@@ -1,56 +1,143 @@
 import torch
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
 import logging
 import os
+import shutil
+import tempfile
+from typing import Callable, List
+
+try:
+    from optimum.bettertransformer import BetterTransformer
+except ImportError:
+    BetterTransformer = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def export_to_dir(path: str, export: Callable[[str], None]):
+    """Run ``export`` into a temporary directory and rename it to ``path``.
+
+    An interrupted export then never leaves a half-written ``path`` behind
+    to be reused by later runs.
+    """
+    parent, name = os.path.split(path)
+    export_dir = tempfile.mkdtemp(prefix=f".{name}-", dir=parent)
+    try:
+        export(export_dir)
+        try:
+            os.replace(export_dir, path)
+        except OSError:
+            # Another process finished the same export first
+            if not os.path.isdir(path):
+                raise
+    finally:
+        shutil.rmtree(export_dir, ignore_errors=True)
+
 class NewsCredibilityPredictor:
-    def __init__(self, model_dir="model_output/final_model"):
+    def __init__(self, model_dir="model_output/final_model", use_onnx=False, quantize=False):
         # Get the current directory
         current_dir = os.path.dirname(os.path.abspath(__file__))
         model_path = os.path.join(current_dir, model_dir)
         
-        # Load the model and tokenizer
-        self.tokenizer = DistilBertTokenizer.from_pretrained(model_path)
-        self.model = DistilBertForSequenceClassification.from_pretrained(model_path)
-        self.model.eval()  # Set to evaluation mode
-        
-        # Move model to GPU if available
+        # Use GPU if available
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model.to(self.device)
+        # Int8 weights only pay off with the CPU kernels
+        self.quantized = quantize and self.device.type == "cpu"
+        
+        # Load the model and tokenizer
+        self.tokenizer = DistilBertTokenizerFast.from_pretrained(model_path)
+        self.model = self.load_onnx_model(model_path) if use_onnx else None
+        if self.model is None:
+            self.model = DistilBertForSequenceClassification.from_pretrained(model_path)
+            self.model.eval()  # Set to evaluation mode
+            self.model.to(self.device)
+            if self.device.type == "cuda":
+                # Half precision halves weight and activation memory and runs on tensor cores
+                self.model.to(torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16)
+            if self.quantized:
+                self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+            elif BetterTransformer is not None:
+                # Swap the attention layers for PyTorch's fused scaled_dot_product_attention
+                self.model = BetterTransformer.transform(self.model, keep_original_model=False)
+            if self.device.type == "cuda":
+                # Allow TF32 matmuls and fuse the element-wise ops into fewer kernels;
+                # compilation happens on the first forward pass
+                torch.set_float32_matmul_precision("high")
+                self.model = torch.compile(self.model, mode="reduce-overhead", fullgraph=False, dynamic=True)
         
         logger.info(f"Model loaded from {model_path}")
         logger.info(f"Using device: {self.device}")
 
+    def load_onnx_model(self, model_path: str):
+        """Load an ONNX Runtime copy of the model, exporting it on first use."""
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        except ImportError:
+            logger.warning("optimum[onnxruntime] is not installed, using the PyTorch model")
+            return None
+        
+        onnx_path = f"{model_path}_onnx"
+        if not os.path.isdir(onnx_path):
+            logger.info(f"Exporting ONNX model to {onnx_path}")
+            onnx_model = ORTModelForSequenceClassification.from_pretrained(model_path, export=True)
+            export_to_dir(onnx_path, onnx_model.save_pretrained)
+        
+        provider = "CUDAExecutionProvider" if self.device.type == "cuda" else "CPUExecutionProvider"
+        if not self.quantized:
+            return ORTModelForSequenceClassification.from_pretrained(onnx_path, provider=provider)
+        
+        # The int8 model is quantized once and reloaded from disk afterwards
+        quantized_path = f"{model_path}_onnx_int8"
+        if not os.path.isdir(quantized_path):
+            logger.info(f"Exporting quantized model to {quantized_path}")
+            quantizer = ORTQuantizer.from_pretrained(onnx_path)
+            export_to_dir(quantized_path, lambda save_dir: quantizer.quantize(
+                save_dir=save_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+            ))
+        return ORTModelForSequenceClassification.from_pretrained(
+            quantized_path,
+            file_name="model_quantized.onnx",
+            provider=provider
+        )
+
     def predict(self, text: str) -> dict:
         """Predict the credibility of a news article."""
-        # Prepare the input
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts: List[str]) -> List[dict]:
+        """Predict the credibility of several news articles in one forward pass."""
+        # Prepare the input, padded to the longest text in the batch
         inputs = self.tokenizer(
-            text,
+            texts,
             padding=True,
             truncation=True,
             max_length=512,
             return_tensors="pt"
         )
         
-        # Move inputs to the same device as the model
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        # Move inputs to the same device as the model; pinned host memory lets
+        # the copy to the GPU run asynchronously
+        if self.device.type == "cuda":
+            inputs = {k: v.pin_memory().to(self.device, non_blocking=True) for k, v in inputs.items()}
         
         # Make prediction
-        with torch.no_grad():
+        with torch.inference_mode():
             outputs = self.model(**inputs)
-            probabilities = torch.softmax(outputs.logits, dim=1)
-            prediction = torch.argmax(probabilities, dim=1)
-            confidence = probabilities[0][prediction].item()
+            # Softmax in float32 so half-precision logits keep their resolution
+            probabilities = torch.softmax(outputs.logits.float(), dim=1)
+            predictions = torch.argmax(probabilities, dim=1)
         
-        return {
-            "is_credible": bool(prediction.item()),
-            "confidence": confidence,
-            "credibility_score": float(probabilities[0][1].item())  # Probability of being credible
-        }
+        return [
+            {
+                "is_credible": bool(prediction),
+                "confidence": probs[prediction],
+                "credibility_score": float(probs[1])  # Probability of being credible
+            }
+            for prediction, probs in zip(predictions.tolist(), probabilities.tolist())
+        ]
 
 def main():
     # Initialize predictor
@@ -68,11 +155,11 @@ def main():
         }
     ]
     
-    # Test each article
-    for article in test_articles:
-        text = f"Title: {article['title']}\nContent: {article['content']}"
-        result = predictor.predict(text)
-        
+    # Test all articles in one batch
+    texts = [f"Title: {article['title']}\nContent: {article['content']}" for article in test_articles]
+    results = predictor.predict_batch(texts)
+    
+    for article, result in zip(test_articles, results):
         print("\nArticle:", article['title'])
         print("Credibility:", "Credible" if result['is_credible'] else "Not Credible")
         print(f"Confidence: {result['confidence']:.2%}")